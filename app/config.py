@@ -6,6 +6,18 @@ class Settings:
     ollama_host: str = os.getenv("OLLAMA_HOST", "http://localhost:11434").rstrip("/")
     ollama_model: str = os.getenv("OLLAMA_MODEL", "qwen3:8b")
     embedding_model: str = os.getenv("EMBEDDING_MODEL", "qwen3-embedding:4b")
+    context_token_budget: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+    mmr_lambda: float = float(os.getenv("MMR_LAMBDA", "0.5"))
+    mmr_fetch_k: int = int(os.getenv("MMR_FETCH_K", "20"))
+    mmr_dup_threshold: float = float(os.getenv("MMR_DUP_THRESHOLD", "0.95"))
+    request_log_path: str = os.getenv("REQUEST_LOG_PATH", "~/.robot_dashboard/logs/requests.jsonl")
+    request_log_max_bytes: int = int(os.getenv("REQUEST_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    request_log_backups: int = int(os.getenv("REQUEST_LOG_BACKUPS", "5"))
+    request_log_queue_size: int = int(os.getenv("REQUEST_LOG_QUEUE_SIZE", "1000"))
+    profile_slow_requests: bool = os.getenv("PROFILE_SLOW_REQUESTS", "0").lower() in ("1", "true", "yes")
+    slow_request_ms: float = float(os.getenv("SLOW_REQUEST_MS", "3000"))
+    profile_interval_ms: float = float(os.getenv("PROFILE_INTERVAL_MS", "10"))
+    admin_token: str = os.getenv("ADMIN_TOKEN", "")
 
 _settings: Settings | None = None
 
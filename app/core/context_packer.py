@@ -0,0 +1,187 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# 문장 경계: 종결 부호 뒤 공백, 또는 줄바꿈
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 토큰 수 추정 (UTF-8 바이트 4개당 1토큰, 한글은 글자당 약 0.75토큰)"""
+    if not text:
+        return 0
+    return max(1, (len(text.encode("utf-8")) + 3) // 4)
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """문장 경계를 유지하며 예산에 맞게 앞부분만 남김.
+
+    원문에서 잘라내므로 줄바꿈 등 서식이 유지된다. 온전한 문장이 하나도 들어가지 않으면
+    바이트 단위로 강제로 자른다.
+    """
+    if budget <= 0:
+        return ""
+    if estimate_tokens(text) <= budget:
+        return text
+
+    cut = ""
+    for match in _SENTENCE_SPLIT.finditer(text):
+        candidate = text[:match.start()].rstrip()
+        if estimate_tokens(candidate) > budget:
+            break
+        cut = candidate
+    if cut:
+        return cut
+
+    # estimate_tokens 기준으로 4 * budget 바이트까지 허용
+    return text.encode("utf-8")[:4 * budget].decode("utf-8", errors="ignore").rstrip()
+
+
+def mmr_rank(
+    query_vector: Sequence[float],
+    doc_vectors: Sequence[Sequence[float]],
+    lambda_mult: float = 0.5,
+    dup_threshold: float = 0.95,
+) -> Optional[List[int]]:
+    """MMR(maximal marginal relevance) 순서로 문서 인덱스 반환.
+
+    이미 선택된 문서와 코사인 유사도가 dup_threshold 이상인 문서는 중복으로 보고 제외한다.
+    벡터가 비어 있거나 차원이 맞지 않으면 None.
+    """
+    try:
+        docs = np.asarray(doc_vectors, dtype=np.float32)
+        query = np.asarray(query_vector, dtype=np.float32)
+    except (TypeError, ValueError):
+        return None
+    if docs.ndim != 2 or docs.shape[0] == 0 or query.ndim != 1 or query.shape[0] != docs.shape[1]:
+        return None
+
+    # 코사인 유사도 계산을 위한 정규화
+    docs = docs / np.maximum(np.linalg.norm(docs, axis=1, keepdims=True), 1e-12)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = docs @ query
+    pairwise = docs @ docs.T
+
+    n = docs.shape[0]
+    selected: List[int] = []
+    # 후보별로 선택된 문서와의 최대 유사도를 누적 관리
+    max_sim = np.full(n, -np.inf, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+
+    while available.any():
+        if selected:
+            scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_sim
+        else:
+            scores = relevance.copy()
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+
+        selected.append(best)
+        available[best] = False
+        max_sim = np.maximum(max_sim, pairwise[best])
+        available &= max_sim < dup_threshold
+
+    return selected
+
+
+@dataclass
+class PackedContext:
+    text: str
+    docs: List[Any] = field(default_factory=list)
+    original_tokens: int = 0
+    packed_tokens: int = 0
+    # 문서 순서 결정 방식: "mmr" | "store_mmr" | "retrieval"
+    ranking: str = "retrieval"
+
+    @property
+    def tokens_saved(self) -> int:
+        # 예산 부족으로 문서를 하나도 넣지 못한 경우는 절감이 아니라 손실이므로 0
+        if not self.docs:
+            return 0
+        return max(0, self.original_tokens - self.packed_tokens)
+
+
+class ContextPacker:
+    """검색 문서를 MMR로 재정렬하고 토큰 예산 안에서 프롬프트 컨텍스트를 구성"""
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        lambda_mult: Optional[float] = None,
+        dup_threshold: Optional[float] = None,
+    ):
+        self.token_budget = token_budget if token_budget is not None else settings.context_token_budget
+        self.lambda_mult = lambda_mult if lambda_mult is not None else settings.mmr_lambda
+        self.dup_threshold = dup_threshold if dup_threshold is not None else settings.mmr_dup_threshold
+
+    def _header(self, index: int, doc: Any) -> str:
+        source = doc.metadata.get("source", "unknown")
+        return f"[문서 {index} - {source}]\n"
+
+    def pack(
+        self,
+        docs: List[Any],
+        query_vector: Optional[Sequence[float]] = None,
+        doc_vectors: Optional[Sequence[Sequence[float]]] = None,
+        k: Optional[int] = None,
+    ) -> PackedContext:
+        """문서 목록(검색 순서)을 예산 내 컨텍스트 문자열로 변환.
+
+        k 가 주어지면 MMR 순서 상위 k개까지만 사용한다. 절감량 기준(original_tokens)은
+        기존 방식대로 검색 순서 상위 k개 문서를 그대로 넣었을 때의 토큰 수다.
+        """
+        if not docs:
+            return PackedContext(text="관련 문서가 없습니다.")
+        k = len(docs) if k is None else max(1, k)
+
+        original_tokens = estimate_tokens("\n\n".join(
+            self._header(i, doc) + doc.page_content for i, doc in enumerate(docs[:k], 1)
+        ))
+
+        # 벡터가 없거나 사용할 수 없으면 검색 순서를 그대로 사용
+        order = None
+        if query_vector is not None and doc_vectors is not None and len(doc_vectors) == len(docs):
+            order = mmr_rank(query_vector, doc_vectors, self.lambda_mult, self.dup_threshold)
+        ranking = "mmr" if order is not None else "retrieval"
+        if order is None:
+            order = list(range(len(docs)))
+        order = order[:k]
+
+        parts = []
+        kept_docs = []
+        remaining = self.token_budget
+        for idx in order:
+            doc = docs[idx]
+            header = self._header(len(kept_docs) + 1, doc)
+            # 문서 사이 구분자("\n\n") 비용 포함
+            room = remaining - estimate_tokens(header) - (1 if parts else 0)
+            if room <= 0:
+                break
+
+            content = truncate_to_tokens(doc.page_content, room)
+            if not content:
+                continue
+
+            part = header + content
+            parts.append(part)
+            kept_docs.append(doc)
+            remaining -= estimate_tokens(part) + (1 if len(parts) > 1 else 0)
+
+        if not parts:
+            return PackedContext(text="관련 문서가 없습니다.", original_tokens=original_tokens, ranking=ranking)
+
+        text = "\n\n".join(parts)
+        return PackedContext(
+            text=text,
+            docs=kept_docs,
+            original_tokens=original_tokens,
+            packed_tokens=estimate_tokens(text),
+            ranking=ranking,
+        )
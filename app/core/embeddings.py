@@ -4,6 +4,7 @@ import urllib.request
 from typing import List, Optional
 
 from app.config import get_settings
+from app.core.profiler import profile_thread
 
 settings = get_settings()
 
@@ -13,6 +14,7 @@ class EmbeddingModel:
         self.model_name = model_name or settings.embedding_model
         self.base_url = settings.ollama_host
 
+    @profile_thread
     def _embed_sync(self, text: str) -> List[float]:
         url = f"{self.base_url}/api/embeddings"
         payload = {"model": self.model_name, "prompt": text}
@@ -4,6 +4,7 @@ import urllib.request
 from typing import AsyncIterator, Optional
 
 from app.config import get_settings
+from app.core.profiler import profile_thread
 
 settings = get_settings()
 
@@ -20,6 +21,7 @@ class OllamaLLM:
         self.temperature = temperature
         self.num_ctx = num_ctx
 
+    @profile_thread
     def _generate_sync(self, prompt: str, fmt: str = "") -> str:
         url = f"{self.base_url}/api/generate"
         payload = {
@@ -0,0 +1,189 @@
+import os
+import sys
+import math
+import time
+import functools
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# 샘플링 간격 허용 범위 (ms)
+MIN_INTERVAL_MS = 1.0
+MAX_INTERVAL_MS = 1000.0
+
+
+class ProfileSession:
+    def __init__(self):
+        self.started = time.perf_counter()
+        # 샘플링 대상: 요청 스레드 + 요청이 넘긴 작업을 실행 중인 워커 스레드
+        self.thread_ids = {threading.get_ident()}
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.profile: Optional[Dict[str, Any]] = None
+
+
+# 현재 컨텍스트의 프로파일 세션 (asyncio 태스크와 asyncio.to_thread 로 전파됨)
+_current_session: contextvars.ContextVar[Optional[ProfileSession]] = contextvars.ContextVar(
+    "profile_session", default=None
+)
+
+
+def profile_thread(func: Callable) -> Callable:
+    """워커 스레드에서 실행되는 함수를 현재 요청의 샘플링 대상에 포함시키는 데코레이터"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        session = _current_session.get()
+        if session is None:
+            return func(*args, **kwargs)
+        ident = threading.get_ident()
+        added = ident not in session.thread_ids
+        session.thread_ids.add(ident)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if added:
+                session.thread_ids.discard(ident)
+    return wrapper
+
+
+class SlowRequestProfiler:
+    """느린 요청에 대한 샘플링 프로파일러.
+
+    켜져 있는 동안 요청 스레드(와 profile_thread 로 표시된 워커 스레드)의 스택 스냅샷을 주기적으로 수집하고,
+    소요 시간이 threshold_ms 이상인 요청에만 결과(folded stack 집계)를 남긴다.
+    꺼져 있으면 샘플링 스레드를 띄우지 않는다.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        threshold_ms: Optional[float] = None,
+        interval_ms: Optional[float] = None,
+        max_depth: int = 64,
+        top_n: int = 20,
+    ):
+        self.enabled = enabled if enabled is not None else settings.profile_slow_requests
+        self.threshold_ms = threshold_ms if threshold_ms is not None else settings.slow_request_ms
+        self.interval_ms = min(MAX_INTERVAL_MS, max(MIN_INTERVAL_MS, float(
+            interval_ms if interval_ms is not None else settings.profile_interval_ms
+        )))
+        self.max_depth = max_depth
+        self.top_n = top_n
+
+        self._sessions: List[ProfileSession] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(
+        self,
+        enabled: Optional[bool] = None,
+        threshold_ms: Optional[float] = None,
+        interval_ms: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """관리자 토글용 설정 변경. 유한하지 않은 값은 ValueError"""
+        if threshold_ms is not None and not math.isfinite(threshold_ms):
+            raise ValueError("threshold_ms must be finite")
+        if interval_ms is not None and not math.isfinite(interval_ms):
+            raise ValueError("interval_ms must be finite")
+
+        if enabled is not None:
+            self.enabled = bool(enabled)
+        if threshold_ms is not None:
+            self.threshold_ms = max(0.0, float(threshold_ms))
+        if interval_ms is not None:
+            self.interval_ms = min(MAX_INTERVAL_MS, max(MIN_INTERVAL_MS, float(interval_ms)))
+        # 샘플링 스레드가 대기 중이면 새 간격을 바로 적용하도록 깨움
+        self._wakeup.set()
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": self.threshold_ms,
+            "interval_ms": self.interval_ms,
+        }
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="slow-request-profiler", daemon=True)
+            self._thread.start()
+
+    def _snapshot(self, frames: Dict[int, Any], thread_ids: List[int]) -> List[str]:
+        """지정한 스레드들의 스택을 folded 형식(root;...;leaf)으로 반환"""
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks = []
+        for ident in thread_ids:
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            parts = []
+            while frame is not None and len(parts) < self.max_depth:
+                code = frame.f_code
+                parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            parts.append(names.get(ident, str(ident)))
+            stacks.append(";".join(reversed(parts)))
+        return stacks
+
+    def _run(self):
+        while True:
+            with self._lock:
+                sessions = list(self._sessions)
+            if not sessions:
+                self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            frames = sys._current_frames()
+            for session in sessions:
+                session.samples.update(self._snapshot(frames, list(session.thread_ids)))
+                session.sample_count += 1
+            del frames
+            if self._wakeup.wait(self.interval_ms / 1000.0):
+                self._wakeup.clear()
+
+    @contextmanager
+    def track(self) -> Iterator[ProfileSession]:
+        """요청 구간 추적. 종료 후 느린 요청이면 session.profile 이 채워진다."""
+        session = ProfileSession()
+        if not self.enabled:
+            yield session
+            return
+
+        token = _current_session.set(session)
+        with self._lock:
+            self._sessions.append(session)
+        self._ensure_thread()
+        self._wakeup.set()
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self._sessions.remove(session)
+            _current_session.reset(token)
+            elapsed_ms = (time.perf_counter() - session.started) * 1000.0
+            if elapsed_ms >= self.threshold_ms:
+                session.profile = {
+                    "elapsed_ms": round(elapsed_ms, 1),
+                    "interval_ms": self.interval_ms,
+                    "samples": session.sample_count,
+                    "stacks": [
+                        {"stack": stack, "count": count}
+                        for stack, count in session.samples.most_common(self.top_n)
+                    ],
+                }
+
+
+_profiler_instance: Optional[SlowRequestProfiler] = None
+
+def get_profiler() -> SlowRequestProfiler:
+    global _profiler_instance
+    if _profiler_instance is None:
+        _profiler_instance = SlowRequestProfiler()
+    return _profiler_instance
@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class RequestLogger:
+    """요청/응답/소요 시간을 JSONL로 남기는 비동기 배치 로거.
+
+    요청 경로에서는 bounded queue에 넣기만 하고, 파일 쓰기는 백그라운드 스레드가 담당한다.
+    레코드는 batch_size 개가 모이거나 첫 레코드 이후 flush_interval 초가 지나면 한 번에 기록된다.
+    큐가 가득 차면 기다리지 않고 버린다(dropped 카운트 증가).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        backup_count: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        batch_size: int = 64,
+        flush_interval: float = 1.0,
+    ):
+        self.path = os.path.expanduser(path or settings.request_log_path)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.request_log_max_bytes
+        self.backup_count = backup_count if backup_count is not None else settings.request_log_backups
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(
+            maxsize=queue_size if queue_size is not None else settings.request_log_queue_size
+        )
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.written = 0
+
+        self._thread = threading.Thread(target=self._run, name="request-logger", daemon=True)
+        self._thread.start()
+
+    def log(self, record: Dict[str, Any]) -> bool:
+        """레코드 적재 (절대 블로킹하지 않음). 버려지면 False"""
+        record.setdefault("ts", time.time())
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+    def _collect(self, first: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """batch_size 가 차거나 첫 레코드 이후 flush_interval 이 지날 때까지 모음"""
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if self._stop.is_set() or remaining <= 0:
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _rotate(self):
+        """크기 초과 시 path -> path.1 -> ... -> path.N 으로 밀어냄"""
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src, dst = f"{self.path}.{i}", f"{self.path}.{i + 1}"
+            if os.path.exists(src):
+                os.replace(src, dst)
+        os.replace(self.path, f"{self.path}.1")
+
+    def _write(self, batch: List[Dict[str, Any]]):
+        lines = "".join(
+            json.dumps(r, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+            for r in batch
+        ).encode("utf-8")
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path) and os.path.getsize(self.path) + len(lines) > self.max_bytes:
+            self._rotate()
+
+        with open(self.path, "ab") as f:
+            f.write(lines)
+        self.written += len(batch)
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self._write(self._collect(first))
+            except Exception as e:
+                print(f"[request-log] write failed: {e}")
+
+    def close(self, timeout: float = 2.0):
+        """남은 레코드를 기록하고 종료"""
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+
+
+_request_logger_instance: Optional[RequestLogger] = None
+
+def get_request_logger() -> RequestLogger:
+    global _request_logger_instance
+    if _request_logger_instance is None:
+        _request_logger_instance = RequestLogger()
+        atexit.register(_request_logger_instance.close)
+    return _request_logger_instance
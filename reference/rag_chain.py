@@ -3,6 +3,7 @@ from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime
 
 from app.core.llm import get_llm
+from app.core.context_packer import ContextPacker, PackedContext
 from app.db.vector_store import get_vectorstore
 from app.config import get_settings
 from app.models.schemas import Source
@@ -46,6 +47,13 @@ class RAGChain:
         self.llm = get_llm()
         self.vectorstore = get_vectorstore()
         self.retriever = self.vectorstore.get_retriever()
+        # retriever 가 감싸고 있는 LangChain 벡터스토어 (쿼리 임베딩과 문서 벡터 조회에 사용)
+        self.store = self.retriever.vectorstore
+        self.packer = ContextPacker()
+        # 저장 벡터를 읽을 수 없는 스토어면 처음부터(또는 첫 실패 이후) 스토어 자체 MMR 검색 사용
+        self._use_store_mmr = not hasattr(self.store, "get")
+        if self._use_store_mmr:
+            print("[rag] vectorstore has no get(), using vectorstore MMR search")
 
         self.prompt = PromptTemplate(
             template=SYSTEM_PROMPT,
@@ -64,17 +72,53 @@ class RAGChain:
 
         return "\n".join(formatted)
 
-    def _format_context(self, docs: List) -> str:
-        """검색된 문서 컨텍스트 포맷팅"""
-        if not docs:
-            return "관련 문서가 없습니다."
-
-        context_parts = []
-        for i, doc in enumerate(docs, 1):
-            source = doc.metadata.get("source", "unknown")
-            context_parts.append(f"[문서 {i} - {source}]\n{doc.page_content}")
-
-        return "\n\n".join(context_parts)
+    def _doc_vectors(self, docs: List) -> Optional[List]:
+        """검색된 문서의 저장 벡터를 벡터스토어에서 id로 조회 (Chroma 호환 get)"""
+        ids = [getattr(doc, "id", None) for doc in docs]
+        if any(i is None for i in ids):
+            return None
+        try:
+            stored = self.store.get(ids=ids, include=["embeddings"])
+        except Exception:
+            return None
+        embeddings = stored.get("embeddings")
+        if embeddings is None or len(embeddings) != len(stored.get("ids", [])):
+            return None
+        by_id = dict(zip(stored["ids"], embeddings))
+        if any(i not in by_id for i in ids):
+            return None
+        return [by_id[i] for i in ids]
+
+    def _retrieve_and_pack(self, question: str) -> PackedContext:
+        """쿼리를 한 번만 임베딩해 검색과 MMR 재정렬에 함께 사용하고, 토큰 예산에 맞춰 컨텍스트 구성"""
+        k = self.retriever.search_kwargs.get("k", 4)
+        fetch_k = max(k, settings.mmr_fetch_k)
+        query_vector = self.store.embeddings.embed_query(question)
+
+        if not self._use_store_mmr:
+            docs = self.store.similarity_search_by_vector(query_vector, k=fetch_k)
+            if not docs:
+                return self.packer.pack(docs)
+            doc_vectors = self._doc_vectors(docs)
+            if doc_vectors is not None:
+                packed = self.packer.pack(docs, query_vector, doc_vectors, k=k)
+                if packed.ranking == "mmr":
+                    return packed
+
+            # 이후 요청부터는 검색을 두 번 하지 않도록 스토어 MMR 로 전환 (응답의 ranking 으로도 표시)
+            print("[rag] stored vectors unavailable, switching to vectorstore MMR search")
+            self._use_store_mmr = True
+            return self.packer.pack(docs, k=k)
+
+        docs = self.store.max_marginal_relevance_search_by_vector(
+            query_vector,
+            k=k,
+            fetch_k=fetch_k,
+            lambda_mult=self.packer.lambda_mult,
+        )
+        packed = self.packer.pack(docs, k=k)
+        packed.ranking = "store_mmr"
+        return packed
 
     async def generate(
         self,
@@ -83,14 +127,14 @@ class RAGChain:
         history: List[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """RAG 기반 응답 생성"""
-        # 문서 검색
-        docs = self.retriever.invoke(question)
+        # 문서 검색 + 컨텍스트 압축 (MMR 중복 제거 + 토큰 예산)
+        packed = self._retrieve_and_pack(question)
 
         # 프롬프트 구성
         prompt = self.prompt.format(
             discount=discount,
             current_date=datetime.now().strftime("%Y-%m-%d"),
-            context=self._format_context(docs),
+            context=packed.text,
             history=self._format_history(history or []),
             question=question
         )
@@ -104,13 +148,15 @@ class RAGChain:
                 content=doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
                 metadata=doc.metadata
             )
-            for doc in docs
+            for doc in packed.docs
         ]
 
         return {
             "content": response.strip(),
             "sources": sources,
-            "type": self._detect_response_type(question)
+            "type": self._detect_response_type(question),
+            "tokens_saved": packed.tokens_saved,
+            "ranking": packed.ranking
         }
 
     async def generate_stream(
@@ -120,14 +166,14 @@ class RAGChain:
         history: List[Dict[str, str]] = None
     ) -> AsyncIterator[Dict[str, Any]]:
         """RAG 기반 스트리밍 응답 생성"""
-        # 문서 검색
-        docs = self.retriever.invoke(question)
+        # 문서 검색 + 컨텍스트 압축 (MMR 중복 제거 + 토큰 예산)
+        packed = self._retrieve_and_pack(question)
 
         # 프롬프트 구성
         prompt = self.prompt.format(
             discount=discount,
             current_date=datetime.now().strftime("%Y-%m-%d"),
-            context=self._format_context(docs),
+            context=packed.text,
             history=self._format_history(history or []),
             question=question
         )
@@ -138,7 +184,7 @@ class RAGChain:
                 content=doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
                 metadata=doc.metadata
             )
-            for doc in docs
+            for doc in packed.docs
         ]
 
         # 스트리밍 응답
@@ -153,7 +199,9 @@ class RAGChain:
         yield {
             "content": "",
             "done": True,
-            "sources": sources
+            "sources": sources,
+            "tokens_saved": packed.tokens_saved,
+            "ranking": packed.ranking
         }
 
     def _detect_response_type(self, question: str) -> str:
@@ -5,9 +5,14 @@ import json
 import os
 import urllib.parse
 import asyncio
+import time
+import hmac
+import math
 
 from app.config import get_settings
 from app.core.rag_chain import get_rag_chain
+from app.core.request_log import get_request_logger
+from app.core.profiler import get_profiler
 
 mimetypes.add_type("application/javascript", ".js")
 mimetypes.add_type("text/css", ".css")
@@ -35,6 +40,37 @@ def _send_json(handler: http.server.BaseHTTPRequestHandler, obj, status=200):
     handler.end_headers()
     handler.wfile.write(data)
 
+def _is_admin(handler: http.server.BaseHTTPRequestHandler) -> bool:
+    # ADMIN_TOKEN 미설정 시 관리자 API 비활성화
+    if not settings.admin_token:
+        return False
+    token = handler.headers.get("X-Admin-Token", "")
+    return hmac.compare_digest(token.encode("utf-8"), settings.admin_token.encode("utf-8"))
+
+def _is_finite_number(value) -> bool:
+    # json 은 Infinity/NaN 과 매우 큰 정수도 허용하므로 float 변환까지 확인
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return False
+    try:
+        return math.isfinite(float(value))
+    except OverflowError:
+        return False
+
+def _is_log_path(handler: http.server.SimpleHTTPRequestHandler, path: str) -> bool:
+    """요청 로그 파일(순환 백업 포함)과 로그 디렉터리를 가리키는 경로인지"""
+    target = os.path.realpath(handler.translate_path(path))
+    log_file = os.path.realpath(os.path.expanduser(settings.request_log_path))
+    if target == log_file or target.startswith(log_file + "."):
+        return True
+    log_dir = os.path.dirname(log_file)
+    # 로그 디렉터리가 정적 파일 루트 자체이면 디렉터리 차단은 하지 않음 (파일만 차단)
+    if log_dir == os.path.realpath(handler.directory):
+        return False
+    return target == log_dir or target.startswith(log_dir + os.sep)
+
+def _admin_status():
+    return {"profiling": get_profiler().status(), "request_log": get_request_logger().stats()}
+
 class Handler(http.server.SimpleHTTPRequestHandler):
     def end_headers(self):
         self.send_header("Cache-Control", "no-store")
@@ -51,12 +87,45 @@ class Handler(http.server.SimpleHTTPRequestHandler):
             if not message:
                 return _send_json(self, {"error": "message is required"}, status=400)
 
+            record = {"question": message, "discount": discount, "history_len": len(history)}
+            started = time.perf_counter()
+            with get_profiler().track() as prof:
+                try:
+                    chain = get_rag_chain()
+                    result = asyncio.run(chain.generate(question=message, discount=discount, history=history))
+                    record.update(status=200, response=result)
+                except Exception as e:
+                    result = {"error": str(e)}
+                    record.update(status=500, error=str(e))
+            record["elapsed_ms"] = round((time.perf_counter() - started) * 1000.0, 1)
+            if prof.profile:
+                record["profile"] = prof.profile
+            get_request_logger().log(record)
+            return _send_json(self, result, status=record["status"])
+
+        if parsed.path == "/api/admin/profiling":
+            if not _is_admin(self):
+                return _send_json(self, {"error": "forbidden"}, status=403)
+            length = int(self.headers.get("Content-Length", "0") or "0")
             try:
-                chain = get_rag_chain()
-                result = asyncio.run(chain.generate(question=message, discount=discount, history=history))
-                return _send_json(self, result, status=200)
-            except Exception as e:
-                return _send_json(self, {"error": str(e)}, status=500)
+                payload = json.loads(self.rfile.read(length).decode("utf-8") if length > 0 else "{}")
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                return _send_json(self, {"error": "invalid JSON"}, status=400)
+            if not isinstance(payload, dict):
+                return _send_json(self, {"error": "JSON object is required"}, status=400)
+            enabled = payload.get("enabled")
+            if enabled is not None and not isinstance(enabled, bool):
+                return _send_json(self, {"error": "enabled must be a boolean"}, status=400)
+            for key in ("threshold_ms", "interval_ms"):
+                value = payload.get(key)
+                if value is not None and not _is_finite_number(value):
+                    return _send_json(self, {"error": f"{key} must be a finite number"}, status=400)
+            get_profiler().configure(
+                enabled=enabled,
+                threshold_ms=payload.get("threshold_ms"),
+                interval_ms=payload.get("interval_ms"),
+            )
+            return _send_json(self, _admin_status(), status=200)
 
         return _send_json(self, {"error": "not found"}, status=404)
 
@@ -79,6 +148,15 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                     "error": str(e)
                 }, status=200)
 
+        if parsed.path == "/api/admin/profiling":
+            if not _is_admin(self):
+                return _send_json(self, {"error": "forbidden"}, status=403)
+            return _send_json(self, _admin_status(), status=200)
+
+        # 요청 로그는 정적 파일로 노출하지 않음
+        if _is_log_path(self, parsed.path):
+            return _send_json(self, {"error": "not found"}, status=404)
+
         return super().do_GET()
 
 if __name__ == "__main__":